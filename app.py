@@ -1,7 +1,20 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+import httpx
+import numpy as np
+import orjson
 import streamlit as st
 import pandas as pd
-import requests
-import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+from numba import njit, prange
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Serialize figures for the browser with orjson (native numpy support)
+# instead of the stdlib json encoder.
+pio.json.config.default_engine = "orjson"
 
 # ==================================================
 # PAGE CONFIG
@@ -37,8 +50,20 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+VOLATILITY_WINDOW = 7
+PLOT_MAX_POINTS = 1000
+
+# Past this many points the trend line is rasterized rather than drawn.
+RASTERIZE_MIN_POINTS = 20000
+RASTER_WIDTH = 1000
+RASTER_HEIGHT = 300
+
 SOLANA_COLORS = ["#9d5cff", "#14f195", "#00ffa3", "#c77dff", "#7f6cff"]
 
+
+def bar_colors(n):
+    return [SOLANA_COLORS[i % len(SOLANA_COLORS)] for i in range(n)]
+
 # ==================================================
 # HARD-DEFINED SOLANA PROTOCOLS (STABLE)
 # ==================================================
@@ -53,76 +78,443 @@ SOLANA_PROTOCOLS = [
 # ==================================================
 # DATA FUNCTIONS
 # ==================================================
-@st.cache_data
-def load_protocol_tvl(slug):
-    url = f"https://api.llama.fi/protocol/{slug}"
-    r = requests.get(url)
+@dataclass(frozen=True)
+class TvlSeries:
+    # Column arrays instead of a DataFrame: second-resolution dates and
+    # float32 TVL halve the cached footprint, with precision to spare.
+    dates: np.ndarray
+    tvl: np.ndarray
 
-    if r.status_code != 200:
-        return None
+    def __len__(self):
+        return len(self.tvl)
 
-    data = r.json()
 
+def parse_protocol_tvl(data):
     if "tvl" not in data or not isinstance(data["tvl"], list):
         return None
 
-    df = pd.DataFrame(data["tvl"])
+    # Records without a date can't be placed on the timeline; drop them.
+    records = [
+        r for r in data["tvl"]
+        if isinstance(r, dict) and r.get("date") is not None
+    ]
 
-    if df.empty or "totalLiquidityUSD" not in df.columns:
+    if not any("totalLiquidityUSD" in r for r in records):
         return None
 
-    df["date"] = pd.to_datetime(df["date"], unit="s")
-    return df
+    # Records are flat {"date", "totalLiquidityUSD"} dicts, so pull the two
+    # columns straight into arrays instead of inferring a DataFrame.
+    # A missing TVL value becomes NaN, as it did in the DataFrame.
+    n = len(records)
+    dates = np.fromiter(
+        (r["date"] for r in records), dtype=np.int64, count=n
+    ).astype("datetime64[s]")
+    tvl = np.fromiter(
+        (
+            np.nan if r.get("totalLiquidityUSD") is None
+            else r["totalLiquidityUSD"]
+            for r in records
+        ),
+        dtype=np.float32,
+        count=n
+    )
 
+    # DefiLlama already returns ascending dates; only sort when it doesn't,
+    # so every consumer can rely on chronological order.
+    if np.any(dates[1:] < dates[:-1]):
+        order = np.argsort(dates, kind="stable")
+        dates, tvl = dates[order], tvl[order]
 
-@st.cache_data
-def build_protocol_snapshot():
-    rows = []
+    return TvlSeries(dates=dates, tvl=tvl)
 
-    for p in SOLANA_PROTOCOLS:
-        hist = load_protocol_tvl(p["slug"])
-        if hist is not None:
-            rows.append({
-                "name": p["name"],
-                "slug": p["slug"],
-                "tvl": hist["totalLiquidityUSD"].iloc[-1]
-            })
 
-    return pd.DataFrame(rows)
+async def load_protocol_tvl(client, slug):
+    url = f"https://api.llama.fi/protocol/{slug}"
+
+    # Transport and decode failures degrade to "no data" for this protocol
+    # only, instead of failing the whole gather.
+    try:
+        r = await client.get(url)
+
+        if r.status_code != 200:
+            return None
+
+        data = orjson.loads(r.content)
+    except (httpx.HTTPError, orjson.JSONDecodeError):
+        return None
+
+    return parse_protocol_tvl(data)
+
+
+async def fetch_all_histories(slugs):
+    # HTTP/2 multiplexes every protocol request over a single TLS
+    # connection, so the whole batch costs one handshake.
+    transport = httpx.AsyncHTTPTransport(http2=True, retries=3)
+
+    # Long TVL histories are megabytes of JSON. httpx already advertises
+    # every encoding it can decode (br via the httpx[brotli] extra), so
+    # Accept-Encoding is left to it.
+    headers = {"Accept": "application/json"}
+
+    async with httpx.AsyncClient(
+        transport=transport,
+        headers=headers,
+        timeout=10
+    ) as client:
+        histories = await asyncio.gather(
+            *(load_protocol_tvl(client, slug) for slug in slugs)
+        )
+
+    return dict(zip(slugs, histories))
+
+
+# Held by reference rather than copied on every hit; consumers must
+# treat the returned histories as read-only. The fetch timestamp lets
+# downstream caches key on which fetch they were built from.
+@st.cache_resource(ttl=3600)
+def load_all_histories():
+    slugs = [p["slug"] for p in SOLANA_PROTOCOLS]
+    histories = asyncio.run(fetch_all_histories(slugs))
+    return time.time(), histories
+
+
+def daily_pct_change(tvl):
+    # Same layout as Series.pct_change(): NaN first, then x[t] / x[t-1] - 1.
+    daily_change = np.empty_like(tvl, dtype=float)
+    daily_change[0] = np.nan
+    daily_change[1:] = tvl[1:] / tvl[:-1] - 1.0
+    return daily_change
+
+
+def rolling_volatility(tvl, window=VOLATILITY_WINDOW):
+    # Rolling sample std of daily % change, aligned with the input and
+    # NaN-padded like pct_change().rolling(window).std().
+    out = np.full(len(tvl), np.nan)
+    daily_change = daily_pct_change(tvl)[1:]
+
+    if len(daily_change) >= window:
+        windows = sliding_window_view(daily_change, window)
+        out[window:] = windows.std(axis=1, ddof=1)
+
+    return out
+
+
+def stack_histories(columns):
+    # Right-align every history in one (protocols, days) float32 matrix;
+    # starts[p] is the first populated column of row p.
+    n_days = max(len(tvl) for tvl in columns)
+    mat = np.full((len(columns), n_days), np.nan, dtype=np.float32)
+    starts = np.empty(len(columns), dtype=np.int64)
+
+    for p, tvl in enumerate(columns):
+        starts[p] = n_days - len(tvl)
+        mat[p, starts[p]:] = tvl
+
+    return mat, starts
+
+
+@njit(parallel=True, cache=True, error_model="numpy")
+def adoption_kernel(mat, starts, window, out_growth, out_volatility):
+    # Growth plus mean rolling sample std of daily % change per row. Each
+    # window is recomputed two-pass (mean, then squared deviations): O(window)
+    # per step and allocation-free, and unlike running sums a single huge
+    # move can't leave a rounding residual that corrupts later windows.
+    n_days = mat.shape[1]
+
+    for p in prange(mat.shape[0]):
+        row = mat[p]
+        start = starts[p]
+        out_growth[p] = np.float64(row[n_days - 1]) / row[start] - 1.0
+
+        vol_sum = 0.0
+        vol_count = 0
+
+        # Window ending at t holds the changes into days t - window + 1 .. t.
+        for t in range(start + window, n_days):
+            mean = 0.0
+            finite = True
+            for k in range(t - window + 1, t + 1):
+                r = np.float64(row[k]) / row[k - 1] - 1.0
+                if not np.isfinite(r):
+                    finite = False
+                    break
+                mean += r
+
+            # Windows touching a non-finite change count as NaN and are
+            # skipped, like rolling().std().mean() does.
+            if not finite:
+                continue
+
+            mean /= window
+            sq_dev = 0.0
+            for k in range(t - window + 1, t + 1):
+                d = np.float64(row[k]) / row[k - 1] - 1.0 - mean
+                sq_dev += d * d
+
+            vol_sum += np.sqrt(sq_dev / (window - 1))
+            vol_count += 1
+
+        if vol_count > 0:
+            out_volatility[p] = vol_sum / vol_count
+        else:
+            out_volatility[p] = np.nan
+
+
+def lttb_indices(x, y, n_out=PLOT_MAX_POINTS):
+    # Largest-Triangle-Three-Buckets: keeps the first and last point and,
+    # per bucket, the point spanning the largest triangle with the last
+    # kept point and the next bucket's centroid.
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+
+        if i + 2 < len(edges):
+            next_lo, next_hi = hi, edges[i + 2]
+            avg_x = x[next_lo:next_hi].mean()
+            avg_y = y[next_lo:next_hi].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+
+    return idx
+
+
+def min_max_normalize(values):
+    # nanmin/nanmax skip NaN like Series.min/max, so a protocol with a NaN
+    # metric stays NaN without wiping out the rest of the column.
+    lo, hi = np.nanmin(values), np.nanmax(values)
+
+    # A flat column carries no ranking signal; map it to 0 instead of 0/0.
+    if hi == lo:
+        return np.where(np.isnan(values), np.nan, 0.0)
+
+    return (values - lo) / (hi - lo)
 
 
-@st.cache_data
-def compute_adoption_metrics():
-    rows = []
+# Snapshot and AQS metrics come out of one walk over the histories.
+# Shared by reference across reruns: callers must treat the returned frames
+# as immutable and derive new frames (sort, filter) instead of assigning.
+@st.cache_resource(ttl=3600)
+def build_snapshot_and_metrics():
+    snapshot_rows = []
+    names = []
+    columns = []
+    _, histories = load_all_histories()
 
     for p in SOLANA_PROTOCOLS:
-        hist = load_protocol_tvl(p["slug"])
-        if hist is None or len(hist) < 14:
+        hist = histories[p["slug"]]
+        if hist is None:
             continue
 
-        hist = hist.sort_values("date")
-        hist["daily_change"] = hist["totalLiquidityUSD"].pct_change()
+        snapshot_rows.append({
+            "name": p["name"],
+            "slug": p["slug"],
+            "tvl": float(hist.tvl[-1])
+        })
+
+        if len(hist) >= 14:
+            names.append(p["name"])
+            columns.append(hist.tvl)
+
+    growth_rate = np.empty(len(names))
+    volatility = np.empty(len(names))
+
+    if names:
+        mat, starts = stack_histories(columns)
+        adoption_kernel(mat, starts, VOLATILITY_WINDOW, growth_rate, volatility)
+
+    metrics_df = pd.DataFrame({
+        "protocol": names,
+        "growth_rate": growth_rate,
+        "volatility": volatility
+    })
 
-        growth_rate = (
-            hist["totalLiquidityUSD"].iloc[-1]
-            / hist["totalLiquidityUSD"].iloc[0]
-            - 1
+    if not metrics_df.empty:
+        norm_growth = min_max_normalize(metrics_df["growth_rate"].to_numpy())
+        norm_volatility = min_max_normalize(
+            metrics_df["volatility"].to_numpy()
         )
 
-        volatility = hist["daily_change"].rolling(7).std().mean()
+        metrics_df["norm_growth"] = norm_growth
+        metrics_df["norm_volatility"] = norm_volatility
+        metrics_df["adoption_quality_score"] = (
+            norm_growth * 0.6 +
+            (1.0 - norm_volatility) * 0.4
+        )
+
+    return pd.DataFrame(snapshot_rows), metrics_df
+
+# ==================================================
+# CHART FUNCTIONS
+# ==================================================
+# Figures are cached by reference so reruns skip construction and
+# validation; st.plotly_chart only reads them, and so must everyone else.
+@st.cache_resource(ttl=3600)
+def build_tvl_fig(df_snapshot):
+    order = np.argsort(-df_snapshot["tvl"].to_numpy(), kind="stable")
+    df_tvl_sorted = df_snapshot.iloc[order]
+
+    fig_tvl = go.Figure(
+        go.Bar(
+            x=df_tvl_sorted["name"].to_numpy(),
+            y=df_tvl_sorted["tvl"].to_numpy(),
+            marker_color=bar_colors(len(df_tvl_sorted))
+        )
+    )
+
+    fig_tvl.update_layout(
+        title="Total Value Locked (TVL) Across Solana DeFi",
+        xaxis_title="Protocol",
+        yaxis_title="TVL (USD)",
+        showlegend=False
+    )
+
+    return fig_tvl
 
-        rows.append({
-            "protocol": p["name"],
-            "growth_rate": growth_rate,
-            "volatility": volatility
-        })
 
-    return pd.DataFrame(rows)
+def add_raster_line(fig, dates, values, color):
+    # Datashader draws every point into a fixed pixel grid, so the image
+    # costs O(pixels) no matter how long the history is. Imported here so
+    # only the rare raster path pays for loading it.
+    import datashader as ds
+    import datashader.transfer_functions as tf
+
+    x = dates.astype(np.int64).astype(float)
+    x0, x1 = x[0], x[-1]
+    y0, y1 = float(np.nanmin(values)), float(np.nanmax(values))
+    if y1 == y0:
+        y1 = y0 + 1.0
+
+    canvas = ds.Canvas(
+        plot_width=RASTER_WIDTH,
+        plot_height=RASTER_HEIGHT,
+        x_range=(x0, x1),
+        y_range=(y0, y1)
+    )
+    agg = canvas.line(
+        pd.DataFrame({"x": x, "y": values.astype(float)}), "x", "y"
+    )
+    image = tf.shade(agg, cmap=[color], how="linear").to_pil()
+
+    start = np.datetime_as_string(dates[0])
+    end = np.datetime_as_string(dates[-1])
+
+    # Date axes size layout images in milliseconds.
+    fig.add_layout_image(
+        source=image,
+        xref="x",
+        yref="y",
+        x=start,
+        y=y1,
+        sizex=(x1 - x0) * 1000,
+        sizey=y1 - y0,
+        xanchor="left",
+        yanchor="top",
+        sizing="stretch",
+        layer="above"
+    )
+    fig.update_xaxes(type="date", range=[start, end])
+    fig.update_yaxes(range=[y0, y1])
+
+
+@st.cache_resource(ttl=3600)
+def build_trend_figs(_series, protocol, fetched_at):
+    # Keyed on (protocol, fetched_at) rather than hashing the arrays, so the
+    # charts refresh together with the histories behind the snapshot and AQS
+    # table.
+    tvl = _series.tvl
+    volatility = rolling_volatility(tvl)
+
+    # Plot a fixed number of points so payload and render time stay flat
+    # as the history grows.
+    idx = lttb_indices(_series.dates.astype(np.int64), tvl)
+
+    plot_dates = _series.dates[idx]
+
+    # Volatility gets its own LTTB pass so its peaks survive; the first
+    # VOLATILITY_WINDOW values are NaN padding and are skipped.
+    vol_idx = VOLATILITY_WINDOW + lttb_indices(
+        _series.dates[VOLATILITY_WINDOW:].astype(np.int64),
+        volatility[VOLATILITY_WINDOW:]
+    )
+
+    rasterize = len(_series) >= RASTERIZE_MIN_POINTS
+
+    # When rasterized, the downsampled trace stays (invisible) for hover.
+    fig_trend = go.Figure(
+        go.Scattergl(
+            x=plot_dates,
+            y=tvl[idx],
+            mode="lines",
+            line=dict(color="rgba(0, 0, 0, 0)" if rasterize else "#14f195")
+        )
+    )
+    fig_trend.update_layout(
+        title=f"{protocol} — TVL Trend",
+        xaxis_title="date",
+        yaxis_title="TVL (USD)"
+    )
+
+    if rasterize:
+        add_raster_line(fig_trend, _series.dates, tvl, "#14f195")
+
+    fig_vol = go.Figure(
+        go.Scattergl(
+            x=_series.dates[vol_idx],
+            y=volatility[vol_idx],
+            mode="lines",
+            line=dict(color="#9d5cff")
+        )
+    )
+    fig_vol.update_layout(
+        title=f"{protocol} — TVL Volatility (7-Day)",
+        xaxis_title="date",
+        yaxis_title="Volatility"
+    )
+
+    return fig_trend, fig_vol
+
+
+@st.cache_resource(ttl=3600)
+def build_score_fig(ranking_df):
+    fig_score = go.Figure(
+        go.Bar(
+            x=ranking_df["protocol"].to_numpy(),
+            y=ranking_df["adoption_quality_score"].to_numpy(),
+            marker_color=bar_colors(len(ranking_df))
+        )
+    )
+
+    fig_score.update_layout(
+        title="Adoption Quality Score by Protocol",
+        xaxis_title="protocol",
+        yaxis_title="adoption_quality_score",
+        showlegend=False
+    )
+
+    return fig_score
 
 # ==================================================
 # LOAD DATA
 # ==================================================
-df_solana = build_protocol_snapshot()
+df_solana, metrics_df = build_snapshot_and_metrics()
 
 # ==================================================
 # HEADER
@@ -158,9 +550,7 @@ col1, col2, col3 = st.columns(3)
 
 col1.metric("Protocols Analyzed", len(df_solana))
 
-top_protocol = df_solana.sort_values(
-    "tvl", ascending=False
-).iloc[0]["name"]
+top_protocol = df_solana.loc[df_solana["tvl"].idxmax(), "name"]
 
 col2.metric("Top TVL Protocol", top_protocol)
 
@@ -174,18 +564,7 @@ col3.metric(
 # ==================================================
 st.subheader("Protocol TVL Comparison")
 
-fig_tvl = px.bar(
-    df_solana.sort_values("tvl", ascending=False),
-    x="name",
-    y="tvl",
-    color="name",
-    color_discrete_sequence=SOLANA_COLORS,
-    labels={"name": "Protocol", "tvl": "TVL (USD)"},
-    title="Total Value Locked (TVL) Across Solana DeFi"
-)
-
-fig_tvl.update_layout(showlegend=False)
-st.plotly_chart(fig_tvl, use_container_width=True)
+st.plotly_chart(build_tvl_fig(df_solana), use_container_width=True)
 
 # ==================================================
 # PROTOCOL SELECTION
@@ -199,35 +578,21 @@ selected_protocol = st.selectbox(
     list(protocol_map.keys())
 )
 
-df_hist = load_protocol_tvl(protocol_map[selected_protocol])
+fetched_at, histories = load_all_histories()
+selected_series = histories[protocol_map[selected_protocol]]
 
 # ==================================================
 # TVL TREND + VOLATILITY
 # ==================================================
-if df_hist is None:
+if selected_series is None:
     st.warning("TVL history not available for this protocol.")
 else:
-    fig_trend = px.line(
-        df_hist,
-        x="date",
-        y="totalLiquidityUSD",
-        title=f"{selected_protocol} — TVL Trend",
-        labels={"totalLiquidityUSD": "TVL (USD)"},
-        color_discrete_sequence=["#14f195"]
+    fig_trend, fig_vol = build_trend_figs(
+        selected_series,
+        selected_protocol,
+        fetched_at
     )
     st.plotly_chart(fig_trend, use_container_width=True)
-
-    df_hist["daily_change"] = df_hist["totalLiquidityUSD"].pct_change()
-    df_hist["rolling_volatility"] = df_hist["daily_change"].rolling(7).std()
-
-    fig_vol = px.line(
-        df_hist,
-        x="date",
-        y="rolling_volatility",
-        title=f"{selected_protocol} — TVL Volatility (7-Day)",
-        labels={"rolling_volatility": "Volatility"},
-        color_discrete_sequence=["#9d5cff"]
-    )
     st.plotly_chart(fig_vol, use_container_width=True)
 
 # ==================================================
@@ -235,26 +600,7 @@ else:
 # ==================================================
 st.subheader("Adoption Quality Score (AQS)")
 
-metrics_df = compute_adoption_metrics()
-
 if not metrics_df.empty:
-    metrics_df["norm_growth"] = (
-        metrics_df["growth_rate"] - metrics_df["growth_rate"].min()
-    ) / (
-        metrics_df["growth_rate"].max() - metrics_df["growth_rate"].min()
-    )
-
-    metrics_df["norm_volatility"] = (
-        metrics_df["volatility"] - metrics_df["volatility"].min()
-    ) / (
-        metrics_df["volatility"].max() - metrics_df["volatility"].min()
-    )
-
-    metrics_df["adoption_quality_score"] = (
-        metrics_df["norm_growth"] * 0.6 +
-        (1 - metrics_df["norm_volatility"]) * 0.4
-    )
-
     ranking_df = metrics_df.sort_values(
         "adoption_quality_score",
         ascending=False
@@ -267,17 +613,7 @@ if not metrics_df.empty:
         use_container_width=True
     )
 
-    fig_score = px.bar(
-        ranking_df,
-        x="protocol",
-        y="adoption_quality_score",
-        color="protocol",
-        color_discrete_sequence=SOLANA_COLORS,
-        title="Adoption Quality Score by Protocol"
-    )
-
-    fig_score.update_layout(showlegend=False)
-    st.plotly_chart(fig_score, use_container_width=True)
+    st.plotly_chart(build_score_fig(ranking_df), use_container_width=True)
 
 # ==================================================
 # INTERPRETATION
@@ -0,0 +1,45 @@
+import ast
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+APP_PATH = Path(__file__).resolve().parents[1] / "app.py"
+
+
+@pytest.fixture
+def load_app():
+    # app.py is a Streamlit script that fetches and renders on import, so
+    # pull out only the named top-level definitions plus literal constants.
+    def load(*names, **extra_globals):
+        source = APP_PATH.read_text(encoding="utf-8")
+        namespace = {
+            "np": np,
+            "pd": pd,
+            "dataclass": dataclass,
+            "sliding_window_view": sliding_window_view,
+            **extra_globals
+        }
+
+        for node in ast.parse(source).body:
+            is_constant = (
+                isinstance(node, ast.Assign)
+                and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id.isupper()
+                and isinstance(node.value, ast.Constant)
+            )
+            is_wanted = (
+                isinstance(node, (ast.FunctionDef, ast.ClassDef))
+                and node.name in names
+            )
+
+            if is_constant or is_wanted:
+                code = compile(ast.Module([node], []), str(APP_PATH), "exec")
+                exec(code, namespace)
+
+        return namespace
+
+    return load
@@ -0,0 +1,34 @@
+import numpy as np
+
+
+def test_lttb_keeps_endpoints_in_order(load_app):
+    lttb_indices = load_app("lttb_indices")["lttb_indices"]
+
+    rng = np.random.default_rng(0)
+    x = np.arange(5000) * 86400
+    y = np.cumsum(rng.normal(size=5000))
+
+    idx = lttb_indices(x, y, n_out=1000)
+
+    assert len(idx) == 1000
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_keeps_an_isolated_spike(load_app):
+    lttb_indices = load_app("lttb_indices")["lttb_indices"]
+
+    y = np.zeros(5000)
+    y[3210] = 100.0
+
+    idx = lttb_indices(np.arange(5000), y, n_out=100)
+
+    assert 3210 in idx
+
+
+def test_lttb_returns_everything_when_short(load_app):
+    lttb_indices = load_app("lttb_indices")["lttb_indices"]
+
+    idx = lttb_indices(np.arange(10), np.arange(10.0), n_out=1000)
+
+    assert np.array_equal(idx, np.arange(10))
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+numba = pytest.importorskip("numba")
+
+WINDOW = 7
+
+
+def random_walk(n, seed, scale=1e9):
+    rng = np.random.default_rng(seed)
+    return np.cumprod(1 + rng.normal(0, 0.02, n)) * scale
+
+
+def reference(tvl):
+    s = pd.Series(tvl.astype(float))
+    growth = s.iloc[-1] / s.iloc[0] - 1
+    volatility = s.pct_change().rolling(WINDOW).std().mean()
+    return growth, volatility
+
+
+@pytest.fixture
+def kernel(load_app):
+    app = load_app(
+        "stack_histories",
+        "adoption_kernel",
+        njit=numba.njit,
+        prange=numba.prange
+    )
+
+    def run(columns):
+        mat, starts = app["stack_histories"](columns)
+        growth = np.empty(len(columns))
+        volatility = np.empty(len(columns))
+        app["adoption_kernel"](mat, starts, WINDOW, growth, volatility)
+        return growth, volatility
+
+    return run
+
+
+def test_kernel_matches_pandas_rolling_std(kernel):
+    smooth = random_walk(900, seed=0)
+
+    # A protocol launching at near-zero TVL: one enormous early move.
+    spike = np.concatenate([[0.01, 5.0], random_walk(1500, seed=1)])
+
+    with_zero = random_walk(400, seed=2)
+    with_zero[50] = 0.0
+
+    with_nan = random_walk(600, seed=3)
+    with_nan[100:103] = np.nan
+
+    short = random_walk(30, seed=4)
+
+    columns = [
+        np.asarray(c, dtype=np.float32)
+        for c in (smooth, spike, with_zero, with_nan, short)
+    ]
+    growth, volatility = kernel(columns)
+
+    for i, tvl in enumerate(columns):
+        expected_growth, expected_volatility = reference(tvl)
+        assert growth[i] == pytest.approx(expected_growth, rel=1e-9)
+        assert volatility[i] == pytest.approx(expected_volatility, rel=1e-9)
+
+
+def test_kernel_volatility_is_nan_without_a_finite_window(kernel):
+    tvl = np.full(10, np.nan, dtype=np.float32)
+    _, volatility = kernel([tvl])
+    assert np.isnan(volatility[0])
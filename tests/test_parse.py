@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def parse(load_app):
+    return load_app("TvlSeries", "parse_protocol_tvl")["parse_protocol_tvl"]
+
+
+def test_parse_returns_sorted_compact_arrays(parse):
+    series = parse({"tvl": [
+        {"date": 1700086400, "totalLiquidityUSD": 5.5},
+        {"date": 1700000000, "totalLiquidityUSD": 3}
+    ]})
+
+    assert series.dates.dtype == np.dtype("datetime64[s]")
+    assert series.tvl.dtype == np.float32
+    assert series.dates.astype(np.int64).tolist() == [1700000000, 1700086400]
+    assert series.tvl.tolist() == [3.0, 5.5]
+
+
+def test_parse_fills_missing_tvl_and_skips_dateless_records(parse):
+    series = parse({"tvl": [
+        {"date": 1700000000},
+        {"date": 1700086400, "totalLiquidityUSD": 5},
+        {"totalLiquidityUSD": 3},
+        {"date": 1700172800, "totalLiquidityUSD": None}
+    ]})
+
+    assert len(series) == 3
+    assert np.isnan(series.tvl[0]) and np.isnan(series.tvl[2])
+    assert series.tvl[1] == 5
+
+
+@pytest.mark.parametrize("data", [
+    {},
+    {"tvl": None},
+    {"tvl": []},
+    {"tvl": [{"date": 1700000000}]}
+])
+def test_parse_rejects_payloads_without_tvl(parse, data):
+    assert parse(data) is None
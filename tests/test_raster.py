@@ -0,0 +1,52 @@
+import base64
+import io
+
+import numpy as np
+import pytest
+
+ds = pytest.importorskip("datashader")
+go = pytest.importorskip("plotly.graph_objects")
+Image = pytest.importorskip("PIL.Image")
+
+
+def decode_image(source):
+    _, payload = source.split(",", 1)
+    return np.asarray(Image.open(io.BytesIO(base64.b64decode(payload))))
+
+
+def test_add_raster_line_places_image_on_data_extent(load_app):
+    app = load_app("add_raster_line", go=go)
+
+    n = 30000
+    start = np.datetime64("2020-01-01T00:00:00", "s")
+    dates = start + np.arange(n) * np.timedelta64(1, "D")
+    values = np.linspace(1e6, 5e6, n).astype(np.float32)
+
+    fig = go.Figure(go.Scattergl(x=dates, y=values, mode="lines"))
+    app["add_raster_line"](fig, dates, values, "#14f195")
+
+    (image,) = fig.layout.images
+    span_seconds = (dates[-1] - dates[0]).astype(np.int64)
+
+    assert image.xref == "x" and image.yref == "y"
+    assert image.x == np.datetime_as_string(dates[0])
+    assert image.sizex == pytest.approx(span_seconds * 1000)
+    assert image.y == pytest.approx(5e6)
+    assert image.sizey == pytest.approx(4e6)
+    assert image.sizing == "stretch"
+    assert tuple(fig.layout.xaxis.range) == (
+        np.datetime_as_string(dates[0]),
+        np.datetime_as_string(dates[-1])
+    )
+
+    pixels = decode_image(image.source)
+    height, width = pixels.shape[:2]
+    alpha = pixels[..., 3]
+
+    assert (width, height) == (app["RASTER_WIDTH"], app["RASTER_HEIGHT"])
+
+    # A rising series runs from bottom-left to top-right of the image.
+    assert alpha[-3:, :3].any()
+    assert alpha[:3, -3:].any()
+    assert not alpha[:height // 4, :width // 4].any()
+    assert not alpha[-(height // 4):, -(width // 4):].any()